@@ -1,17 +1,36 @@
 """FastAPI application configuration and router wiring."""
 from __future__ import annotations
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from models.game import APP_VERSION, GameData
 from routes import battles, players, shops, world
 
-app = FastAPI(title="Retro RPG API", version=APP_VERSION)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare per-process caches before serving traffic."""
+
+    world.reset_caches()
+    world.preload_locations(app.state.data)
+    yield
+
+
+app = FastAPI(
+    title="Retro RPG API",
+    version=APP_VERSION,
+    lifespan=lifespan,
+)
 
 game_data = GameData()
 app.add_middleware(
@@ -21,9 +40,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Battle snapshots carry the whole log; small placeholder payloads stay uncompressed.
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 app.state.data = game_data
-app.state.battles = {}
+world.bind_data(game_data)
+# Battles expire an hour after their last action; the lock shards serialize actions per battle.
+app.state.battles = TTLCache(maxsize=10_000, ttl=3600)
+app.state.battle_locks = [asyncio.Lock() for _ in range(16)]
 
 app.include_router(players.router)
 app.include_router(world.router)
@@ -31,36 +55,48 @@ app.include_router(battles.router)
 app.include_router(shops.router)
 
 
-def _frontend_dir() -> Path | None:
-    """Return the path to the bundled frontend directory if it exists."""
+_FRONTEND_CANDIDATE = Path(__file__).resolve().parent.parent / "frontend"
+# Bundled frontend directory, resolved once at import; None when not shipped.
+_FRONTEND_DIR: Path | None = _FRONTEND_CANDIDATE if _FRONTEND_CANDIDATE.exists() else None
 
-    candidate = Path(__file__).resolve().parent.parent / "frontend"
-    return candidate if candidate.exists() else None
 
+if _FRONTEND_DIR is not None:
+    app.mount("/static", StaticFiles(directory=_FRONTEND_DIR), name="frontend_static")
 
-if (frontend_dir := _frontend_dir()) is not None:
-    app.mount("/static", StaticFiles(directory=frontend_dir), name="frontend_static")
+    _INDEX_PATH = _FRONTEND_DIR / "index.html"
+    # FRONTEND_RELOAD=1 serves index.html from disk on every request for development.
+    _INDEX_RELOAD = os.getenv("FRONTEND_RELOAD") == "1"
+    _INDEX_BYTES = (
+        _INDEX_PATH.read_bytes() if not _INDEX_RELOAD and _INDEX_PATH.exists() else None
+    )
 
     @app.get("/", response_class=HTMLResponse, include_in_schema=False)
-    def frontend_index() -> HTMLResponse:
+    async def frontend_index() -> Response:
         """Serve the single page app entrypoint."""
 
-        index_path = frontend_dir / "index.html"
-        try:
-            return HTMLResponse(index_path.read_text(encoding="utf-8"))
-        except FileNotFoundError as exc:  # pragma: no cover - development safeguard
-            raise HTTPException(status_code=404, detail="index.html not found") from exc
+        if _INDEX_BYTES is not None:
+            return HTMLResponse(_INDEX_BYTES)
+        if _INDEX_RELOAD and _INDEX_PATH.exists():
+            return FileResponse(_INDEX_PATH, media_type="text/html")
+        raise HTTPException(status_code=404, detail="index.html not found")
 
 
 @app.post("/api/save")
-def save_game():
+async def save_game():
     """Placeholder endpoint for future server-side saving."""
 
     return {"status": "not_implemented"}
 
 
 @app.get("/api/load")
-def load_game():
+async def load_game():
     """Placeholder endpoint for future server-side loading."""
 
     return {"status": "not_implemented"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Battle sessions live in process memory, so stay on a single worker.
+    uvicorn.run("main:app", loop="uvloop", http="httptools")
@@ -4,11 +4,13 @@ from __future__ import annotations
 import math
 import random
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class CoreStats:
     """Core stats shared by both player and enemy combatants."""
 
@@ -18,7 +20,7 @@ class CoreStats:
     agi: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Combatant:
     """Mutable state of a combat participant."""
 
@@ -36,6 +38,8 @@ class Combatant:
     spells: List[str] = field(default_factory=list)
     is_boss: bool = False
     next_exp: int = 0
+    # (spell, mp cost, type) for castable attack/heal spells, filled on first enemy turn.
+    spell_cache: Optional[List[Tuple[Dict, int, str]]] = field(default=None, repr=False, compare=False)
 
     def clone(self) -> "Combatant":
         """Return a copy of the combatant for snapshot serialization."""
@@ -63,7 +67,7 @@ class Combatant:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class BattleFlags:
     """Flags that describe modifiers applied when the battle started."""
 
@@ -71,7 +75,7 @@ class BattleFlags:
     preemptive: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class BattleSession:
     """In-memory representation of an on-going battle."""
 
@@ -79,18 +83,21 @@ class BattleSession:
     player: Combatant
     enemy: Combatant
     turn: str
-    log: List[str]
+    log: Deque[str]
     flags: BattleFlags
     rng: random.Random
     ended: bool = False
 
-    def snapshot(self) -> Dict:
-        """Build a serializable snapshot of the session."""
+    def snapshot(self, since: int = 0) -> Dict:
+        """Build a serializable snapshot of the session.
+
+        Only log lines from index ``since`` onwards are included.
+        """
 
         return {
             "id": self.id,
             "turn": self.turn,
-            "log": list(self.log),
+            "log": list(islice(self.log, since, None)) if since else list(self.log),
             "player": combatant_to_dict(self.player),
             "enemy": combatant_to_dict(self.enemy),
             "ended": self.ended,
@@ -102,7 +109,11 @@ class BattleSession:
 
 
 def combatant_to_dict(entity: Combatant) -> Dict:
-    """Serialize a combatant."""
+    """Serialize a combatant.
+
+    ``inventory`` and ``spells`` reference the live containers, so the result
+    must be encoded before the combatant is mutated again.
+    """
 
     return {
         "id": entity.id,
@@ -120,8 +131,8 @@ def combatant_to_dict(entity: Combatant) -> Dict:
         },
         "exp": entity.exp,
         "gold": entity.gold,
-        "inventory": dict(entity.inventory),
-        "spells": list(entity.spells),
+        "inventory": entity.inventory,
+        "spells": entity.spells,
         "is_boss": entity.is_boss,
         "next_exp": entity.next_exp,
     }
@@ -140,9 +151,39 @@ def parse_power_range(expr: str) -> Tuple[int, int]:
     return int(low), int(high)
 
 
+def parse_scale_coef(expr: str) -> float:
+    """Parse a scale expression such as ``"MAG*0.5"`` into its MAG coefficient."""
+
+    if expr.startswith("MAG"):
+        return float(expr.split("*")[1])
+    return 0.0
+
+
+def prepare_battle_entry(entry: Dict) -> Dict:
+    """Return a copy of a spell or item entry with its power fields pre-parsed.
+
+    Non-range powers such as ``"half"`` get ``power_range=None`` and spells
+    also get ``scale_coef``. The source entry is left untouched so it can
+    still be served to clients.
+    """
+
+    prepared = dict(entry)
+    power = entry.get("power")
+    prepared["power_range"] = parse_power_range(power) if power and "-" in power else None
+    if "scale" in entry:
+        prepared["scale_coef"] = parse_scale_coef(entry["scale"])
+    return prepared
+
+
+MAX_LEVEL = 99
+NEXT_EXP_TABLE: Tuple[int, ...] = tuple(math.floor(10 + (lvl ** 1.6)) for lvl in range(MAX_LEVEL + 1))
+
+
 def calc_next_exp(level: int) -> int:
     """Compute the experience needed for the next level."""
 
+    if 0 <= level <= MAX_LEVEL:
+        return NEXT_EXP_TABLE[level]
     return math.floor(10 + (level ** 1.6))
 
 
@@ -152,9 +193,9 @@ def roll_preemptive(player: Combatant, enemy: Combatant, rng: random.Random) ->
     base_preemptive = 0.20
     base_surprise = 0.10
     agi_diff = player.stats.agi - enemy.stats.agi
-    adj = clamp(agi_diff * 0.01, -0.10, 0.10)
-    preemptive_chance = clamp(base_preemptive + adj, 0.05, 0.35)
-    surprise_chance = clamp(base_surprise - adj, 0.05, 0.35)
+    adj = max(-0.10, min(agi_diff * 0.01, 0.10))
+    preemptive_chance = max(0.05, min(base_preemptive + adj, 0.35))
+    surprise_chance = max(0.05, min(base_surprise - adj, 0.35))
     roll = rng.random()
     if roll < preemptive_chance:
         return BattleFlags(preemptive=True, surprised=False)
@@ -179,19 +220,25 @@ def physical_damage(
     if force_miss:
         return 0, False, True
 
-    miss_chance = clamp(0.05 + (defender.stats.agi - attacker.stats.agi) * 0.03, 0.02, 0.30)
-    if not force_crit and rng.random() < miss_chance:
+    rand = rng.random
+    rint = rng.randint
+    att_stats = attacker.stats
+    def_stats = defender.stats
+    agi_diff = att_stats.agi - def_stats.agi
+    miss_chance = max(0.02, min(0.05 - agi_diff * 0.03, 0.30))
+    if not force_crit and rand() < miss_chance:
         return 0, False, True
+    atk = att_stats.atk
 
-    crit_chance = clamp(0.05 + (attacker.stats.agi - defender.stats.agi) * 0.02, 0.02, 0.15)
-    is_crit = force_crit or rng.random() < crit_chance
+    crit_chance = max(0.02, min(0.05 + agi_diff * 0.02, 0.15))
+    is_crit = force_crit or rand() < crit_chance
 
-    base_roll = attacker.stats.atk + rng.randint(-1, 2)
+    base_roll = atk + rint(-1, 2)
     if is_crit:
-        crit_bonus = attacker.stats.atk + rng.randint(1, 3)
+        crit_bonus = atk + rint(1, 3)
         damage = max(1, base_roll + crit_bonus)
     else:
-        damage = max(1, base_roll - defender.stats.defense // 2)
+        damage = max(1, base_roll - def_stats.defense // 2)
     return damage, is_crit, False
 
 
@@ -203,13 +250,12 @@ def spell_damage(
 ) -> Tuple[int, str]:
     """Resolve a spell effect and return value and message suffix."""
 
-    low, high = parse_power_range(spell["power"])
+    low, high = spell.get("power_range") or parse_power_range(spell["power"])
     base = rng.randint(low, high)
-    scale = 0.0
-    if spell["scale"].startswith("MAG"):
-        coef = float(spell["scale"].split("*")[1])
-        scale = math.floor(caster.stats.mag * coef)
-    total = base + int(scale)
+    coef = spell.get("scale_coef")
+    if coef is None:
+        coef = parse_scale_coef(spell["scale"])
+    total = base + math.floor(caster.stats.mag * coef)
     if spell["type"] == "attack":
         return max(1, total), "ダメージ!"
     if spell["type"] == "heal":
@@ -230,13 +276,13 @@ def apply_item_effect(user: Combatant, target: Combatant, item: Dict, rng: rando
 
     item_type = item["type"]
     if item_type == "heal":
-        low, high = parse_power_range(item["power"])
+        low, high = item.get("power_range") or parse_power_range(item["power"])
         amount = rng.randint(low, high)
         healed = min(amount, target.max_hp - target.hp)
         target.hp += healed
         return f"{target.name}のHPが{healed}かいふくした!"
     if item_type == "mp":
-        low, high = parse_power_range(item["power"])
+        low, high = item.get("power_range") or parse_power_range(item["power"])
         amount = rng.randint(low, high)
         restored = min(amount, target.max_mp - target.mp)
         target.mp += restored
@@ -254,14 +300,26 @@ def apply_item_effect(user: Combatant, target: Combatant, item: Dict, rng: rando
     raise ValueError("Unsupported item type")
 
 
+# Run chance 0.4 + 5% per AGI point of advantage, clamped to [0.2, 0.9]; the
+# clamp saturates outside these AGI differences.
+RUN_DIFF_MIN = -4
+RUN_DIFF_MAX = 10
+RUN_CHANCE_TABLE: Tuple[float, ...] = tuple(
+    max(0.2, min(0.4 + diff * 0.05, 0.9)) for diff in range(RUN_DIFF_MIN, RUN_DIFF_MAX + 1)
+)
+
+
 def attempt_run(player: Combatant, enemy: Combatant, rng: random.Random) -> bool:
     """Determine whether the player successfully runs from battle."""
 
     if enemy.is_boss:
         return False
-    base = 0.4
     diff = player.stats.agi - enemy.stats.agi
-    chance = clamp(base + diff * 0.05, 0.2, 0.9)
+    if diff < RUN_DIFF_MIN:
+        diff = RUN_DIFF_MIN
+    elif diff > RUN_DIFF_MAX:
+        diff = RUN_DIFF_MAX
+    chance = RUN_CHANCE_TABLE[diff - RUN_DIFF_MIN]
     return rng.random() < chance
 
 
@@ -276,7 +334,7 @@ def level_up(player: Combatant, rng: random.Random) -> List[str]:
     """Apply level-up stat increases and return log lines."""
 
     logs = []
-    while player.level < 99 and player.exp >= player.next_exp:  # type: ignore[attr-defined]
+    while player.level < MAX_LEVEL and player.exp >= player.next_exp:  # type: ignore[attr-defined]
         player.level += 1
         hp_gain = rng.randint(3, 6)
         mp_gain = rng.randint(1, 3)
@@ -308,11 +366,19 @@ def enemy_turn(session: BattleSession, spells: Dict[str, Dict]) -> None:
     player = session.player
     log = session.log
     rng = session.rng
-    available_spells = [spells[s] for s in enemy.spells if s in spells and spells[s]["type"] in {"attack", "heal"} and enemy.mp >= spells[s]["mp"]]
+    spell_cache = enemy.spell_cache
+    if spell_cache is None:
+        spell_cache = enemy.spell_cache = [
+            (sp, sp["mp"], sp["type"])
+            for s in enemy.spells
+            if (sp := spells.get(s)) is not None and sp["type"] in ("attack", "heal")
+        ]
+    enemy_mp = enemy.mp
+    available_spells = [entry for entry in spell_cache if enemy_mp >= entry[1]]
     action_choice = "attack"
     if available_spells:
         # Simple AI: heal if HP below 40%, else cast attack sometimes
-        if enemy.hp < enemy.max_hp * 0.4 and any(sp["type"] == "heal" for sp in available_spells):
+        if enemy.hp < enemy.max_hp * 0.4 and any(kind == "heal" for _, _, kind in available_spells):
             action_choice = "heal"
         elif rng.random() < 0.3:
             action_choice = "attack_spell"
@@ -325,14 +391,14 @@ def enemy_turn(session: BattleSession, spells: Dict[str, Dict]) -> None:
             suffix = "!!" if crit else "!"
             log.append(f"{enemy.name}のこうげき! {damage}のダメージ{suffix}")
     elif action_choice == "heal":
-        heal_spell = next(sp for sp in available_spells if sp["type"] == "heal")
+        heal_spell = next(sp for sp, _, kind in available_spells if kind == "heal")
         enemy.mp -= heal_spell["mp"]
         before = enemy.hp
         healed, _ = spell_damage(enemy, enemy, heal_spell, rng)
         enemy.hp = min(enemy.max_hp, before + healed)
         log.append(f"{enemy.name}は{heal_spell['name']}をとなえた! {healed}かいふくした!")
     else:  # attack spell
-        attack_spell = available_spells[0]
+        attack_spell = available_spells[0][0]
         enemy.mp -= attack_spell["mp"]
         damage, suffix = spell_damage(enemy, player, attack_spell, rng)
         player.hp = max(0, player.hp - damage)
@@ -355,7 +421,7 @@ def start_battle(player: Combatant, enemy: Combatant, rng_seed: Optional[int] =
         turn = "enemy"
     elif not flags.preemptive:
         # Determine initiative normally
-        if rng.random() < 0.5 + clamp((player.stats.agi - enemy.stats.agi) * 0.05, -0.3, 0.3):
+        if rng.random() < 0.5 + max(-0.3, min((player.stats.agi - enemy.stats.agi) * 0.05, 0.3)):
             turn = "player"
         else:
             turn = "enemy"
@@ -364,7 +430,7 @@ def start_battle(player: Combatant, enemy: Combatant, rng_seed: Optional[int] =
         player=player,
         enemy=enemy,
         turn=turn,
-        log=[],
+        log=deque(),
         flags=flags,
         rng=rng,
     )
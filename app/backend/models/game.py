@@ -5,11 +5,19 @@ import json
 import os
 import random
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 from fastapi import HTTPException
 
-from .domain import Combatant, CoreStats, combatant_to_dict
+from .domain import (
+    Combatant,
+    CoreStats,
+    combatant_to_dict,
+    prepare_battle_entry,
+)
+
+if TYPE_CHECKING:
+    from .schemas import CombatantModel, CombatantStruct
 
 APP_VERSION = "0.1.0"
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,6 +38,10 @@ class GameData:
         self.monsters_raw = load_json(DATA_DIR / "monsters.json")
         self.spells = {entry["id"]: entry for entry in load_json(DATA_DIR / "spells.json")}
         self.items = {entry["id"]: entry for entry in load_json(DATA_DIR / "items.json")}
+        # Copies with pre-parsed fields for the battle logic; self.spells and
+        # self.items keep the shape that is served to clients.
+        self.battle_spells = {key: prepare_battle_entry(entry) for key, entry in self.spells.items()}
+        self.battle_items = {key: prepare_battle_entry(entry) for key, entry in self.items.items()}
         self.maps = load_json(DATA_DIR / "maps.json")
         self.monsters = {entry["id"]: entry for entry in self.monsters_raw}
         self.monsters_by_area: Dict[str, List[Dict]] = {}
@@ -41,7 +53,23 @@ class GameData:
             "cave": {"hp": (2, 12), "atk": (1, 4), "def": (1, 4), "mag": (0, 3), "agi": (1, 3)},
             "boss": {"hp": (0, 0), "atk": (0, 0), "def": (0, 0), "mag": (0, 0), "agi": (0, 0)},
         }
+        # Flattened (lo, hi) bounds for hp, atk, def, mag, agi and mp; enemy MP
+        # rolls use the mag bounds.
+        self.area_bonus_flat: Dict[str, Tuple[int, ...]] = {
+            area: (*b["hp"], *b["atk"], *b["def"], *b["mag"], *b["agi"], *b["mag"])
+            for area, b in self.area_bonus.items()
+        }
+        # (monsters, bonus bounds, level) per area so an encounter resolves with one lookup.
+        self.area_tables: Dict[str, Tuple[Tuple[Dict, ...], Tuple[int, ...], int]] = {
+            area: (
+                tuple(monsters),
+                self.area_bonus_flat.get(area) or self.area_bonus_flat["grass"],
+                self.area_level.get(area, 1),
+            )
+            for area, monsters in self.monsters_by_area.items()
+        }
         self.rng = random.Random()
+        self._cors_origins = tuple(os.getenv("CORS_ALLOW_ORIGINS", "*").split(","))
 
     def new_player(self, name: str) -> Combatant:
         """Create a new player with the default stats."""
@@ -63,25 +91,40 @@ class GameData:
             next_exp=int(10 + (1 ** 1.6)),
         )
 
+    def encounter_table(self, area: str) -> Tuple[Tuple[Dict, ...], Tuple[int, ...], int]:
+        """Return the precomputed ``(monsters, bonus bounds, level)`` table for an area."""
+
+        table = self.area_tables.get(area)
+        if table is None:
+            raise HTTPException(status_code=404, detail="No monsters for this area")
+        return table
+
     def generate_enemy(self, area: str) -> Combatant:
         """Generate an enemy from the area tables."""
 
-        monsters = self.monsters_by_area.get(area)
-        if not monsters:
-            raise HTTPException(status_code=404, detail="No monsters for this area")
+        return self._sample_enemy(self.encounter_table(area))
+
+    def _sample_enemy(self, table: Tuple[Tuple[Dict, ...], Tuple[int, ...], int]) -> Combatant:
+        """Roll a concrete enemy from an area encounter table."""
+
+        monsters, bonuses, level = table
         template = self.rng.choice(monsters)
-        bonuses = self.area_bonus.get(area, self.area_bonus["grass"])
+        randint = self.rng.randint
+        (
+            hp_lo, hp_hi, atk_lo, atk_hi, def_lo, def_hi,
+            mag_lo, mag_hi, agi_lo, agi_hi, mp_lo, mp_hi,
+        ) = bonuses
         base = template["base"]
-        hp = base["hp"] + self.rng.randint(*bonuses["hp"])
-        mp = base["mp"] + self.rng.randint(*bonuses["mag"])
-        atk = base["atk"] + self.rng.randint(*bonuses["atk"])
-        defense = base["def"] + self.rng.randint(*bonuses["def"])
-        mag = base["mag"] + self.rng.randint(*bonuses["mag"])
-        agi = base["agi"] + self.rng.randint(*bonuses["agi"])
+        hp = base["hp"] + randint(hp_lo, hp_hi)
+        mp = base["mp"] + randint(mp_lo, mp_hi)
+        atk = base["atk"] + randint(atk_lo, atk_hi)
+        defense = base["def"] + randint(def_lo, def_hi)
+        mag = base["mag"] + randint(mag_lo, mag_hi)
+        agi = base["agi"] + randint(agi_lo, agi_hi)
         return Combatant(
             id=template["id"],
             name=template["name"],
-            level=self.area_level.get(area, 1),
+            level=level,
             max_hp=hp,
             max_mp=mp,
             hp=hp,
@@ -95,32 +138,32 @@ class GameData:
             next_exp=0,
         )
 
-    def build_combatant_from_payload(self, data: Dict) -> Combatant:
-        """Recreate a combatant from API data."""
+    def build_combatant_from_model(self, model: CombatantModel | CombatantStruct) -> Combatant:
+        """Recreate a combatant from a validated request model."""
 
-        stats = CoreStats(
-            atk=data["stats"]["atk"],
-            defense=data["stats"]["defense"],
-            mag=data["stats"]["mag"],
-            agi=data["stats"]["agi"],
-        )
+        stats = model.stats
         return Combatant(
-            id=data["id"],
-            name=data["name"],
-            level=data.get("level", 1),
-            max_hp=data["max_hp"],
-            max_mp=data["max_mp"],
-            hp=data["hp"],
-            mp=data["mp"],
-            stats=stats,
-            exp=data.get("exp", 0),
-            gold=data.get("gold", 0),
-            inventory=data.get("inventory", {}),
-            spells=data.get("spells", []),
-            is_boss=data.get("is_boss", False),
-            next_exp=data.get("next_exp", 0),
+            id=model.id,
+            name=model.name,
+            level=model.level,
+            max_hp=model.max_hp,
+            max_mp=model.max_mp,
+            hp=model.hp,
+            mp=model.mp,
+            stats=CoreStats(atk=stats.atk, defense=stats.defense, mag=stats.mag, agi=stats.agi),
+            exp=model.exp,
+            gold=model.gold,
+            inventory=model.inventory,
+            spells=model.spells,
+            is_boss=model.is_boss,
+            next_exp=model.next_exp,
         )
 
+    def location_ids(self) -> List[str]:
+        """Return the ids of all known locations."""
+
+        return list(self.maps)
+
     def location(self, location_id: str) -> Dict:
         """Return location metadata."""
 
@@ -147,8 +190,8 @@ class GameData:
             enemy = combatant_to_dict(self.generate_enemy(area))
         return {"encounter": encounter, "threshold": threshold, "enemy": enemy}
 
-    def cors_origins(self) -> List[str]:
+    def cors_origins(self) -> Tuple[str, ...]:
         """Return CORS origins configured via env."""
 
-        return os.getenv("CORS_ALLOW_ORIGINS", "*").split(",")
+        return self._cors_origins
 
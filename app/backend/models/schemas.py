@@ -1,10 +1,13 @@
-"""Pydantic schemas for API requests and responses."""
+"""Pydantic schemas and msgspec structs for API requests and responses."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
+import msgspec
 from pydantic import BaseModel, Field
 
+NonNegativeInt = Annotated[int, msgspec.Meta(ge=0)]
+
 
 class CoreStatsModel(BaseModel):
     """Representation of the main combat stats."""
@@ -77,24 +80,6 @@ class EncounterRollResponse(BaseModel):
     enemy: Optional[CombatantModel] = None
 
 
-class BattleStartRequest(BaseModel):
-    """Request payload to start a battle."""
-
-    player: CombatantModel
-    enemy: CombatantModel
-
-
-class BattleActRequest(BaseModel):
-    """Request payload to act in battle."""
-
-    battleId: str = Field(alias="battleId")
-    action: str
-    payload: Dict[str, str] | None = None
-
-    class Config:
-        populate_by_name = True
-
-
 class ShopBuyRequest(BaseModel):
     """Request payload for buying an item."""
 
@@ -134,3 +119,71 @@ class LoadResponse(BaseModel):
     """Placeholder for server-side load."""
 
     payload: Dict
+
+
+# The structs below mirror CoreStatsModel / CombatantModel field for field;
+# tests/test_battle_api.py checks they stay in sync.
+class CoreStatsStruct(msgspec.Struct):
+    """msgspec counterpart of :class:`CoreStatsModel` for battle requests."""
+
+    atk: NonNegativeInt
+    defense: NonNegativeInt
+    mag: NonNegativeInt
+    agi: NonNegativeInt
+
+
+class CombatantStruct(msgspec.Struct, kw_only=True):
+    """msgspec counterpart of :class:`CombatantModel` for battle requests."""
+
+    id: str
+    name: str
+    level: int
+    max_hp: int
+    max_mp: int
+    hp: int
+    mp: int
+    stats: CoreStatsStruct
+    exp: int
+    gold: int
+    inventory: Dict[str, int]
+    spells: List[str]
+    is_boss: bool = False
+    next_exp: int
+
+
+class BattleStartRequest(msgspec.Struct):
+    """Request payload to start a battle."""
+
+    player: CombatantStruct
+    enemy: CombatantStruct
+
+
+class BattleActRequest(msgspec.Struct):
+    """Request payload to act in battle."""
+
+    battleId: str
+    action: str
+    payload: Optional[Dict[str, str]] = None
+
+
+def struct_request_body(struct_type: type) -> Dict[str, Any]:
+    """Build an ``openapi_extra`` request body documenting a msgspec struct."""
+
+    schema = msgspec.json.schema(struct_type)
+    defs = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}},
+        }
+    }
@@ -1,7 +1,13 @@
 """Battle handling endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request
+import re
+from typing import List, Tuple, Type, TypeVar, Union
+
+import msgspec
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from msgspec import json as mjson
 
 from models.domain import (
     award_loot,
@@ -10,42 +16,112 @@ from models.domain import (
     process_player_action,
     start_battle,
 )
-from models.schemas import BattleActRequest, BattleStartRequest
+from models.schemas import BattleActRequest, BattleStartRequest, struct_request_body
+from routes.responses import json_response
 
 router = APIRouter(prefix="/api", tags=["battles"])
 
+StructT = TypeVar("StructT", bound=msgspec.Struct)
+
+_MISSING_FIELD = re.compile(r"Object missing required field `(?P<field>[^`]+)`")
+_PATH_TOKEN = re.compile(r"\.([^.\[]+)|\[([^\]]+)\]")
+
+
+def _error_loc(path: str) -> Tuple[Union[str, int], ...]:
+    """Turn a msgspec error path such as ``$.player.stats.atk`` into a loc tuple."""
+
+    loc: List[Union[str, int]] = ["body"]
+    for key, index in _PATH_TOKEN.findall(path):
+        if key:
+            loc.append(key)
+        else:
+            loc.append(int(index) if index.isdigit() else index)
+    return tuple(loc)
+
+
+def _validation_error(exc: msgspec.DecodeError) -> RequestValidationError:
+    """Map a msgspec error onto the error list FastAPI returns for Pydantic bodies."""
+
+    if not isinstance(exc, msgspec.ValidationError):
+        return RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body", 0),
+                    "msg": "JSON decode error",
+                    "ctx": {"error": str(exc)},
+                }
+            ]
+        )
+    message, _, path = str(exc).partition(" - at ")
+    loc = _error_loc(path.strip("`"))
+    missing = _MISSING_FIELD.fullmatch(message)
+    if missing is not None:
+        error = {"type": "missing", "loc": (*loc, missing["field"]), "msg": "Field required"}
+    else:
+        error = {"type": "value_error", "loc": loc, "msg": message}
+    return RequestValidationError([error])
 
-@router.post("/battle/start")
-def battle_start(payload: BattleStartRequest, request: Request):
+
+async def _decode_body(request: Request, struct_type: Type[StructT]) -> StructT:
+    """Decode and validate the JSON request body into ``struct_type``."""
+
+    try:
+        return mjson.decode(await request.body(), type=struct_type, strict=False)
+    except msgspec.DecodeError as exc:
+        raise _validation_error(exc) from exc
+
+
+@router.post(
+    "/battle/start",
+    response_model=None,
+    openapi_extra=struct_request_body(BattleStartRequest),
+)
+async def battle_start(request: Request):
     """Initialize a battle and store it in the application state."""
 
+    payload = await _decode_body(request, BattleStartRequest)
     data = request.app.state.data
     battles = request.app.state.battles
-    player = data.build_combatant_from_payload(payload.player.dict())
-    enemy = data.build_combatant_from_payload(payload.enemy.dict())
+    player = data.build_combatant_from_model(payload.player)
+    enemy = data.build_combatant_from_model(payload.enemy)
     session = start_battle(player, enemy)
     battles[session.id] = session
-    return session.snapshot()
+    return json_response(session.snapshot())
+
 
+@router.post(
+    "/battle/act",
+    response_model=None,
+    openapi_extra=struct_request_body(BattleActRequest),
+)
+async def battle_act(request: Request, since: int = Query(0, ge=0)):
+    """Execute a player action and advance the battle.
 
-@router.post("/battle/act")
-def battle_act(payload: BattleActRequest, request: Request):
-    """Execute a player action and advance the battle."""
+    ``since`` limits the returned log to lines from that index onwards.
+    """
 
+    payload = await _decode_body(request, BattleActRequest)
     battles = request.app.state.battles
-    session = battles.get(payload.battleId)
-    if not session:
-        raise HTTPException(status_code=404, detail="Battle not found")
-    data = request.app.state.data
-    process_player_action(session, payload.action, payload.payload or {}, data.items, data.spells)
-    if session.ended and session.enemy.hp <= 0 and payload.action != "run":
-        award_loot(session.player, session.enemy)
-        session.log.extend(level_up(session.player, session.rng))
-    if not session.ended and session.turn == "enemy":
-        enemy_turn(session, data.spells)
-        if session.ended and session.enemy.hp <= 0:
+    locks = request.app.state.battle_locks
+    async with locks[hash(payload.battleId) % len(locks)]:
+        session = battles.get(payload.battleId)
+        if not session:
+            raise HTTPException(status_code=404, detail="Battle not found")
+        data = request.app.state.data
+        process_player_action(
+            session, payload.action, payload.payload or {}, data.battle_items, data.battle_spells
+        )
+        if session.ended and session.enemy.hp <= 0 and payload.action != "run":
             award_loot(session.player, session.enemy)
             session.log.extend(level_up(session.player, session.rng))
-    if session.ended:
-        session.turn = "end"
-    return session.snapshot()
+        if not session.ended and session.turn == "enemy":
+            enemy_turn(session, data.battle_spells)
+            if session.ended and session.enemy.hp <= 0:
+                award_loot(session.player, session.enemy)
+                session.log.extend(level_up(session.player, session.rng))
+        if session.ended:
+            session.turn = "end"
+        # Re-insert so the TTL store counts expiry from the latest action.
+        battles[payload.battleId] = session
+        return json_response(session.snapshot(since))
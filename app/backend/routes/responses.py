@@ -0,0 +1,13 @@
+"""Shared response helpers for the API routers."""
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+
+def json_response(content: Any) -> Response:
+    """Encode already-shaped ``content`` with orjson, skipping FastAPI's encoder."""
+
+    return Response(content=orjson.dumps(content), media_type="application/json")
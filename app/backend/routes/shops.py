@@ -5,12 +5,13 @@ from fastapi import APIRouter, HTTPException, Request
 
 from models.domain import combatant_to_dict
 from models.schemas import InnRestRequest, ShopBuyRequest
+from routes.responses import json_response
 
 router = APIRouter(prefix="/api", tags=["shops"])
 
 
-@router.post("/shop/buy")
-def shop_buy(payload: ShopBuyRequest, request: Request):
+@router.post("/shop/buy", response_model=None)
+async def shop_buy(payload: ShopBuyRequest, request: Request):
     """Return purchase cost information."""
 
     data = request.app.state.data
@@ -20,17 +21,17 @@ def shop_buy(payload: ShopBuyRequest, request: Request):
     if payload.n <= 0 or payload.n > 9:
         raise HTTPException(status_code=400, detail="Invalid quantity")
     cost = payload.n * 8
-    return {"item": item, "cost": cost}
+    return json_response({"item": item, "cost": cost})
 
 
-@router.post("/inn/rest")
-def inn_rest(payload: InnRestRequest, request: Request):
+@router.post("/inn/rest", response_model=None)
+async def inn_rest(payload: InnRestRequest, request: Request):
     """Rest at an inn to fully recover."""
 
     data = request.app.state.data
-    player = data.build_combatant_from_payload(payload.player.dict())
+    player = data.build_combatant_from_model(payload.player)
     player.hp = player.max_hp
     player.mp = player.max_mp
     player.gold = max(0, player.gold - payload.price)
-    return combatant_to_dict(player)
+    return json_response(combatant_to_dict(player))
 
@@ -1,24 +1,153 @@
 """World exploration related endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Request
+import gzip
+import hashlib
+from typing import Annotated, Dict, NamedTuple, Optional
 
+import orjson
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import Response
+
+from models.game import GameData
 from models.schemas import EncounterRollRequest, EncounterRollResponse, LocationResponse
 
 router = APIRouter(prefix="/api", tags=["world"])
 
+_game_data: Optional[GameData] = None
+
+
+def bind_data(data: GameData) -> None:
+    """Bind the application's ``GameData`` for the world routes."""
+
+    global _game_data
+    _game_data = data
+
+
+def get_data() -> GameData:
+    """Dependency returning the ``GameData`` bound via :func:`bind_data`."""
+
+    if _game_data is None:
+        raise RuntimeError("GameData has not been bound to the world router")
+    return _game_data
+
+
+GameDataDep = Annotated[GameData, Depends(get_data, use_cache=True)]
+
+
+LOCATION_CACHE_CONTROL = "public, max-age=3600, immutable"
+
+
+class _LocationEntry(NamedTuple):
+    """Encoded location response with its ETag and optional gzip variant."""
+
+    etag: str
+    body: bytes
+    gzip_etag: str
+    gzip_body: Optional[bytes]
+
+
+# Serialized LocationResponse payloads keyed by location id; only known ids are stored.
+_location_entries: Dict[str, _LocationEntry] = {}
+
+
+def _location_entry(data: GameData, location_id: str) -> _LocationEntry:
+    """Return the encoded location response, building it if missing."""
+
+    entry = _location_entries.get(location_id)
+    if entry is None:
+        model = LocationResponse.model_validate(data.location(location_id))
+        body = orjson.dumps(model.model_dump())
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        entry = _location_entries[location_id] = _LocationEntry(
+            etag=f'"{digest}"',
+            body=body,
+            gzip_etag=f'"{digest}-gzip"',
+            # Tiny bodies can grow when compressed; serve those as-is.
+            gzip_body=compressed if len(compressed) < len(body) else None,
+        )
+    return entry
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return whether an ``If-None-Match`` header value matches ``etag``."""
+
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return whether ``Accept-Encoding`` allows gzip, honouring ``q=0`` exclusions."""
+
+    wildcard: Optional[bool] = None
+    for token in accept_encoding.split(","):
+        coding, _, params = token.partition(";")
+        coding = coding.strip().lower()
+        accepted = True
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    accepted = float(value) > 0
+                except ValueError:
+                    accepted = False
+        if coding in ("gzip", "x-gzip"):
+            return accepted
+        if coding == "*":
+            wildcard = accepted
+    return bool(wildcard)
+
+
+def reset_caches() -> None:
+    """Drop memoized world data so it is rebuilt from the current ``GameData``."""
+
+    _location_entries.clear()
+
+
+def preload_locations(data: GameData) -> None:
+    """Build the cached response for every known location ahead of traffic."""
+
+    for location_id in data.location_ids():
+        _location_entry(data, location_id)
+
 
-@router.get("/world/location/{location_id}", response_model=LocationResponse)
-def get_location(location_id: str, request: Request):
+@router.get(
+    "/world/location/{location_id}",
+    response_class=Response,
+    responses={200: {"model": LocationResponse}, 304: {"description": "Not Modified"}},
+)
+async def get_location(
+    location_id: str,
+    data: GameDataDep,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: str = Header(""),
+) -> Response:
     """Return details about a location."""
 
-    data = request.app.state.data
-    return data.location(location_id)
+    entry = _location_entry(data, location_id)
+    headers = {"cache-control": LOCATION_CACHE_CONTROL, "vary": "Accept-Encoding"}
+    if entry.gzip_body is not None and _accepts_gzip(accept_encoding):
+        etag, body = entry.gzip_etag, entry.gzip_body
+        headers["content-encoding"] = "gzip"
+    else:
+        etag, body = entry.etag, entry.body
+    headers["etag"] = etag
+    if _etag_matches(if_none_match, etag):
+        headers.pop("content-encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
+# No custom response class here: FastAPI then serializes response_model
+# results straight to JSON bytes through Pydantic's dump_json fast path.
 @router.post("/encounter/roll", response_model=EncounterRollResponse)
-def roll_encounter(payload: EncounterRollRequest, request: Request):
+async def roll_encounter(payload: EncounterRollRequest, data: GameDataDep):
     """Roll for a random encounter."""
 
-    data = request.app.state.data
     return data.encounter_roll(payload.areaId, payload.counter)
@@ -1,3 +1,4 @@
+import json
 import random
 import sys
 from pathlib import Path
@@ -5,30 +6,48 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.backend.models.domain import (
+    BattleFlags,
+    BattleSession,
     Combatant,
     CoreStats,
+    apply_item_effect,
     attempt_run,
+    enemy_turn,
+    parse_scale_coef,
     physical_damage,
+    prepare_battle_entry,
     spell_damage,
+    start_battle,
 )
 
+DATA_DIR = Path(__file__).resolve().parents[1] / "app" / "backend" / "data"
+
+
+def load_entries(name: str) -> dict:
+    with (DATA_DIR / name).open(encoding="utf-8") as f:
+        return {entry["id"]: entry for entry in json.load(f)}
+
 
 class StaticRNG:
     """Deterministic RNG used to control combat rolls in tests."""
 
     def __init__(self, random_values=None, int_values=None):
-        self.random_values = list(random_values or [])
-        self.int_values = list(int_values or [])
+        self.random_values = tuple(random_values or ())
+        self.int_values = tuple(int_values or ())
+        self._random_idx = 0
+        self._int_idx = 0
 
     def random(self):
-        if not self.random_values:
+        if self._random_idx >= len(self.random_values):
             return 0.0
-        return self.random_values.pop(0)
+        self._random_idx += 1
+        return self.random_values[self._random_idx - 1]
 
     def randint(self, a, b):
-        if not self.int_values:
+        if self._int_idx >= len(self.int_values):
             return a
-        return self.int_values.pop(0)
+        self._int_idx += 1
+        return self.int_values[self._int_idx - 1]
 
 
 def build_combatant(name: str, atk: int, defense: int, mag: int, agi: int, hp: int = 24, mp: int = 6) -> Combatant:
@@ -99,3 +118,95 @@ def test_boss_run_always_fails():
     boss.is_boss = True
     rng = StaticRNG(random_values=[0.0])
     assert not attempt_run(player, boss, rng)
+
+
+def test_enemy_heals_with_cached_spell_list_when_low():
+    player = build_combatant("hero", 5, 3, 4, 5)
+    enemy = build_combatant("mage", 4, 2, 6, 3, hp=30, mp=10)
+    enemy.hp = 5
+    enemy.spells = ["fire", "heal", "unknown"]
+    spells = {
+        "heal": {"id": "heal", "name": "ヒール", "type": "heal", "mp": 3, "power": "12-16", "scale": "MAG*0.5"},
+        "fire": {"id": "fire", "name": "ファイア", "type": "attack", "mp": 5, "power": "10-14", "scale": "MAG*0.6"},
+    }
+    session = BattleSession(
+        id="b", player=player, enemy=enemy, turn="enemy", log=[], flags=BattleFlags(), rng=random.Random(1)
+    )
+    enemy_turn(session, spells)
+    assert [sp["id"] for sp, _, _ in enemy.spell_cache] == ["fire", "heal"]
+    assert enemy.mp == 7
+    assert enemy.hp > 5
+    assert session.turn == "player"
+
+
+def test_snapshot_since_returns_log_tail():
+    player = build_combatant("hero", 5, 3, 4, 5)
+    enemy = build_combatant("slime", 2, 2, 1, 2, hp=15)
+    session = start_battle(player, enemy, rng_seed=3)
+    session.log.extend(["a", "b", "c"])
+    full = session.snapshot()["log"]
+    assert session.snapshot(since=len(full) - 2)["log"] == ["b", "c"]
+    assert session.snapshot(since=len(full))["log"] == []
+
+
+def test_run_chance_table_matches_formula():
+    for diff in range(-30, 31):
+        player = build_combatant("hero", 5, 3, 4, 40 + diff)
+        enemy = build_combatant("foe", 4, 4, 2, 40)
+        expected = max(0.2, min(0.4 + diff * 0.05, 0.9))
+        assert attempt_run(player, enemy, StaticRNG(random_values=[expected - 1e-9]))
+        assert not attempt_run(player, enemy, StaticRNG(random_values=[expected]))
+
+
+def test_prepared_entries_match_raw_power_strings():
+    spells = load_entries("spells.json")
+    items = load_entries("items.json")
+    for spell in spells.values():
+        prepared = prepare_battle_entry(spell)
+        assert "power_range" not in spell
+        assert "scale_coef" not in spell
+        for seed in range(20):
+            caster = build_combatant("hero", 5, 3, 7, 6)
+            caster.hp = 5
+            raw = spell_damage(caster, caster, spell, random.Random(seed))
+            fast = spell_damage(caster, caster, prepared, random.Random(seed))
+            assert fast == raw
+    for item_id in ("herb", "ether"):
+        prepared = prepare_battle_entry(items[item_id])
+        for seed in range(20):
+            raw_target = build_combatant("hero", 5, 3, 4, 4, hp=80, mp=40)
+            fast_target = build_combatant("hero", 5, 3, 4, 4, hp=80, mp=40)
+            raw_target.hp = fast_target.hp = 1
+            raw_target.mp = fast_target.mp = 0
+            raw = apply_item_effect(raw_target, raw_target, items[item_id], random.Random(seed))
+            fast = apply_item_effect(fast_target, fast_target, prepared, random.Random(seed))
+            assert fast == raw
+            assert (fast_target.hp, fast_target.mp) == (raw_target.hp, raw_target.mp)
+
+
+def test_non_range_power_is_prepared_as_none():
+    items = load_entries("items.json")
+    holywater = prepare_battle_entry(items["holywater"])
+    assert holywater["power_range"] is None
+    assert prepare_battle_entry(items["antidote"])["power_range"] is None
+    target = build_combatant("hero", 5, 3, 4, 4, hp=30)
+    target.hp = 0
+    apply_item_effect(target, target, holywater, random.Random(1))
+    assert target.hp == 15
+
+
+def test_parse_scale_coef():
+    assert parse_scale_coef("MAG*0.6") == 0.6
+    assert parse_scale_coef("NONE") == 0.0
+    assert parse_scale_coef("") == 0.0
+
+
+def test_precomputed_scale_coef_matches_raw_scale():
+    spell = {"type": "attack", "power": "10-14", "scale": "MAG*0.6"}
+    precomputed = dict(spell, scale_coef=0.6)
+    for mag in range(0, 40):
+        caster = build_combatant("mage", 2, 2, mag, 3)
+        target = build_combatant("slime", 2, 2, 1, 2)
+        raw = spell_damage(caster, target, spell, random.Random(mag))
+        fast = spell_damage(caster, target, precomputed, random.Random(mag))
+        assert fast == raw
@@ -0,0 +1,142 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app" / "backend"))
+
+import msgspec
+from cachetools import TTLCache
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models.game import GameData
+from models.schemas import CombatantModel, CombatantStruct, CoreStatsModel, CoreStatsStruct
+from routes import battles
+
+
+def build_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(battles.router)
+    app.state.data = GameData()
+    app.state.battles = TTLCache(maxsize=16, ttl=3600)
+    app.state.battle_locks = [asyncio.Lock() for _ in range(4)]
+    return TestClient(app)
+
+
+def combatant(**overrides) -> dict:
+    entity = {
+        "id": "hero",
+        "name": "Hero",
+        "level": 1,
+        "max_hp": 30,
+        "max_mp": 10,
+        "hp": 30,
+        "mp": 10,
+        "stats": {"atk": 5, "defense": 3, "mag": 2, "agi": 4},
+        "exp": 0,
+        "gold": 0,
+        "inventory": {},
+        "spells": [],
+        "next_exp": 10,
+    }
+    entity.update(overrides)
+    return entity
+
+
+def start_payload(**player_overrides) -> dict:
+    enemy = combatant(id="slime", name="Slime", hp=8, max_hp=8, exp=3, gold=2)
+    return {"player": combatant(**player_overrides), "enemy": enemy}
+
+
+def test_start_and_act():
+    client = build_client()
+    started = client.post("/api/battle/start", json=start_payload())
+    assert started.status_code == 200
+    battle = started.json()
+    assert battle["player"]["name"] == "Hero"
+    acted = client.post(
+        "/api/battle/act", json={"battleId": battle["id"], "action": "attack"}
+    )
+    assert acted.status_code == 200
+    assert acted.json()["id"] == battle["id"]
+
+
+def test_negative_stat_is_rejected():
+    client = build_client()
+    payload = start_payload(stats={"atk": -1, "defense": 3, "mag": 2, "agi": 4})
+    response = client.post("/api/battle/start", json=payload)
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["loc"] == ["body", "player", "stats", "atk"]
+
+
+def test_missing_action_matches_pydantic_shape():
+    client = build_client()
+    response = client.post("/api/battle/act", json={"battleId": "nope"})
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == "missing"
+    assert error["loc"] == ["body", "action"]
+    assert error["msg"] == "Field required"
+
+
+def test_malformed_json_is_rejected():
+    client = build_client()
+    response = client.post(
+        "/api/battle/start",
+        content=b'{"player": ',
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == "json_invalid"
+    assert error["loc"] == ["body", 0]
+
+
+def test_lax_coercion_matches_pydantic():
+    client = build_client()
+    payload = start_payload(level="2", hp=24.0)
+    CombatantModel.model_validate(payload["player"])
+    response = client.post("/api/battle/start", json=payload)
+    assert response.status_code == 200
+    assert response.json()["player"]["level"] == 2
+    assert response.json()["player"]["hp"] == 24
+
+
+def test_structs_mirror_models():
+    for model, struct in ((CoreStatsModel, CoreStatsStruct), (CombatantModel, CombatantStruct)):
+        struct_fields = {field.name: field for field in msgspec.structs.fields(struct)}
+        assert list(struct_fields) == list(model.model_fields)
+        for name, field in model.model_fields.items():
+            struct_default = struct_fields[name].default
+            if field.is_required():
+                assert struct_default is msgspec.NODEFAULT
+            else:
+                assert struct_default == field.default
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_actions_refresh_battle_ttl():
+    clock = FakeTimer()
+    client = build_client()
+    client.app.state.battles = TTLCache(maxsize=16, ttl=3600, timer=clock)
+    payload = start_payload(hp=999, max_hp=999)
+    payload["enemy"].update(hp=999, max_hp=999)
+    active = client.post("/api/battle/start", json=payload).json()["id"]
+    idle = client.post("/api/battle/start", json=payload).json()["id"]
+    for now in (3000, 6000):
+        clock.now = now
+        response = client.post("/api/battle/act", json={"battleId": active, "action": "attack"})
+        assert response.status_code == 200
+    battles = client.app.state.battles
+    assert active in battles
+    assert idle not in battles
+    response = client.post("/api/battle/act", json={"battleId": idle, "action": "attack"})
+    assert response.status_code == 404
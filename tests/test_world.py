@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "app" / "backend"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models.game import GameData
+from routes import world
+from routes.world import _accepts_gzip, _etag_matches
+
+ETAG = '"0123abcd"'
+
+
+def build_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(world.router)
+    data = GameData()
+    world.bind_data(data)
+    world.reset_caches()
+    world.preload_locations(data)
+    return TestClient(app)
+
+
+def test_etag_matches_exact_and_weak():
+    assert _etag_matches(ETAG, ETAG)
+    assert _etag_matches(f"W/{ETAG}", ETAG)
+
+
+def test_etag_matches_wildcard_and_list():
+    assert _etag_matches("*", ETAG)
+    assert _etag_matches(f'"other", W/{ETAG} , "third"', ETAG)
+
+
+def test_etag_mismatch():
+    assert not _etag_matches(None, ETAG)
+    assert not _etag_matches("", ETAG)
+    assert not _etag_matches('"0123abce"', ETAG)
+    assert not _etag_matches('"other", "third"', ETAG)
+
+
+def test_accepts_gzip_honours_q_values():
+    assert _accepts_gzip("gzip, deflate, br")
+    assert _accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert _accepts_gzip("*")
+    assert not _accepts_gzip("")
+    assert not _accepts_gzip("gzip;q=0")
+    assert not _accepts_gzip("gzip; q=0.000, *")
+    assert not _accepts_gzip("*;q=0")
+    assert not _accepts_gzip("gzipped, identity")
+
+
+def test_gzip_refused_with_zero_quality():
+    client = build_client()
+    response = client.get("/api/world/location/grass", headers={"Accept-Encoding": "gzip;q=0"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_gzip_variant_has_its_own_etag():
+    client = build_client()
+    plain = client.get("/api/world/location/grass", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/api/world/location/grass", headers={"Accept-Encoding": "gzip"})
+    assert plain.status_code == gzipped.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+    assert gzipped.json() == plain.json()
+
+
+def test_not_modified_keeps_etag_without_content_encoding():
+    client = build_client()
+    first = client.get("/api/world/location/grass", headers={"Accept-Encoding": "gzip"})
+    etag = first.headers["etag"]
+    second = client.get(
+        "/api/world/location/grass",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert "content-encoding" not in second.headers
+    assert second.headers["cache-control"] == world.LOCATION_CACHE_CONTROL